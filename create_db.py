@@ -1,9 +1,11 @@
 import sqlite3
 import pandas as pd
 
-# Read the CSV file
+# Rows read from the CSV at a time, so peak memory does not grow with the file
+CSV_CHUNKSIZE = 1000
+
+# CSV file to load
 csv_file = 'tools.csv'
-df = pd.read_csv(csv_file)
 
 # Connect to the SQLite database (or create it if it doesn't exist)
 conn = sqlite3.connect('research_lifecycle.db')
@@ -30,29 +32,37 @@ cursor.execute('''
     )
 ''')
 
-# Insert data into LifeCycle table
-lifecycle_data = df[['RESEARCH DATA LIFECYCLE STAGE', 'DESCRIPTION']].drop_duplicates()
-lifecycle_data.columns = ['stage', 'stagedesc']
-lifecycle_data.to_sql('LifeCycle', conn, if_exists='append', index=False)
-
-# Insert data into Tools table
-df = df.rename(columns={
-    'RESEARCH DATA LIFECYCLE STAGE': 'stage',
-    'TOOL CATEGORY TYPE ': 'ToolProvider',
-    'EXAMPLES': 'ToolName',
-    'DESCRIPTION': 'ToolDesc'
-})
-df['ToolLink'] = ''  # Add an empty ToolLink column
-df = df[['ToolName', 'ToolDesc', 'ToolLink', 'stage', 'ToolProvider']]
-
-# Map stage names to their corresponding stage IDs
-stage_ids = pd.read_sql('SELECT stageID, stage FROM LifeCycle', conn)
-df = df.merge(stage_ids, left_on='stage', right_on='stage')
-df = df[['ToolName', 'ToolDesc', 'ToolLink', 'stageID', 'ToolProvider']]
-df.columns = ['ToolName', 'ToolDesc', 'ToolLink', 'stage', 'ToolProvider']
-
-# Insert tools data
-df.to_sql('Tools', conn, if_exists='append', index=False)
-
-conn.commit()
+cursor.execute('CREATE INDEX IF NOT EXISTS idx_tools_stage ON Tools(stage)')
+
+# Stream the CSV and load both tables in a single transaction
+with conn:
+    loaded_stages = set()
+    for df in pd.read_csv(csv_file, chunksize=CSV_CHUNKSIZE):
+        # Insert data into LifeCycle table, skipping stages already loaded from earlier chunks
+        lifecycle_data = df[['RESEARCH DATA LIFECYCLE STAGE', 'DESCRIPTION']].drop_duplicates()
+        new_stages = [row for row in lifecycle_data.itertuples(index=False, name=None) if row not in loaded_stages]
+        loaded_stages.update(new_stages)
+        conn.executemany("INSERT INTO LifeCycle (stage, stagedesc) VALUES (?, ?)", new_stages)
+
+        # Insert data into Tools table
+        df = df.rename(columns={
+            'RESEARCH DATA LIFECYCLE STAGE': 'stage',
+            'TOOL CATEGORY TYPE ': 'ToolProvider',
+            'EXAMPLES': 'ToolName',
+            'DESCRIPTION': 'ToolDesc'
+        })
+        df['ToolLink'] = ''  # Add an empty ToolLink column
+        df = df[['ToolName', 'ToolDesc', 'ToolLink', 'stage', 'ToolProvider']]
+
+        # Map stage names to their corresponding stage IDs, dropping tools whose stage is unknown.
+        # The CSV repeats a stage with several descriptions, so each stage maps to its first stageID.
+        stage_to_id = dict(conn.execute('SELECT stage, MIN(stageID) FROM LifeCycle GROUP BY stage'))
+        df = df.assign(stage=df['stage'].map(stage_to_id)).dropna(subset=['stage']).astype({'stage': int})
+
+        # Insert tools data
+        conn.executemany(
+            "INSERT INTO Tools (ToolName, ToolDesc, ToolLink, stage, ToolProvider) VALUES (?, ?, ?, ?, ?)",
+            df.itertuples(index=False, name=None)
+        )
+
 conn.close()
@@ -1,27 +1,45 @@
 import os
+import re
 import sqlite3
 import pandas as pd
 import logging
-
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from db_utils import apply_bulk_load_pragmas, populate_cycle_connects
 
 # Database and Excel file paths
 DB_FILE = 'research_data_lifecycle.db'
 EXCEL_FILE = 'research_data_lifecycle.xlsx'
 
+# Separator between tool names in a TOOL NAME cell, swallowing the whitespace around the comma
+TOOL_NAME_SEPARATOR = re.compile(r'\s*,\s*')
+
 def is_uppercase(s):
     return s.isupper()
 
+def promote_header_row(df, header_row):
+    # Same column names read_excel(header=header_row) would give, without re-reading the file
+    header = df.iloc[header_row]
+    df = df.iloc[header_row + 1:].reset_index(drop=True)
+    df.columns = [str(col) if pd.notna(col) else f'Unnamed: {i}' for i, col in enumerate(header)]
+    return df
+
+def clean_column_names(df):
+    df.columns = df.columns.str.strip().str.replace('\n', '', regex=False).str.replace('  ', '', regex=False)
+    return df
+
 def initialize_database_from_excel(excel_file, db_file):
-    if os.path.exists(db_file):
-        os.remove(db_file)
-        logging.info(f"Deleted existing database: {db_file}")
+    # Build beside the target and move it into place only once the load has committed,
+    # so a failed or interrupted build never leaves a partial database at db_file
+    build_file = f"{db_file}.{os.getpid()}.tmp"
+    if os.path.exists(build_file):
+        os.remove(build_file)
 
     conn = None
+    built = False
     try:
-        conn = sqlite3.connect(db_file)
-        logging.info(f"Created new database: {db_file}")
+        conn = sqlite3.connect(build_file)
+        logging.info(f"Building new database: {build_file}")
+
+        apply_bulk_load_pragmas(conn)
 
         # Create tables
         conn.executescript('''
@@ -53,12 +71,16 @@ def initialize_database_from_excel(excel_file, db_file):
                 end TEXT,
                 type TEXT
             );
+
+            CREATE INDEX IF NOT EXISTS idx_substage_stage ON SubStage(stage);
+            CREATE INDEX IF NOT EXISTS idx_tools_stage ON Tools(stage);
         ''')
         logging.info("Tables created successfully.")
 
-        sheets = pd.read_excel(excel_file, sheet_name=None)
+        # Parse the workbook once; each sheet's header row is applied in memory below
+        sheets = pd.read_excel(excel_file, sheet_name=None, header=None)
         data_frames = {}
-        for sheet_name in sheets.keys():
+        for sheet_name, raw_sheet in sheets.items():
             if sheet_name == 'Tool categories and description':
                 header_row = 0
             elif is_uppercase(sheet_name):
@@ -66,74 +88,70 @@ def initialize_database_from_excel(excel_file, db_file):
             else:
                 continue
 
-            if len(sheets[sheet_name]) > header_row:
-                data_frames[sheet_name] = pd.read_excel(excel_file, sheet_name=sheet_name, header=header_row)
-                data_frames[sheet_name].columns = [col.strip().replace('\n', '').replace('  ', '') for col in data_frames[sheet_name].columns]
+            if len(raw_sheet) > header_row + 1:
+                data_frames[sheet_name] = clean_column_names(promote_header_row(raw_sheet, header_row))
             else:
                 logging.warning(f"Skipping sheet {sheet_name} as it does not have enough rows.")
 
-        df_stage = data_frames.get('Tool categories and description')
-        if df_stage is not None:
-            lifecycle_data = df_stage['RESEARCH DATA LIFECYCLE STAGE'].unique()
-            for stage in lifecycle_data:
-                conn.execute("INSERT OR REPLACE INTO LifeCycle (stage, stagedesc) VALUES (?, ?)", (stage, df_stage[df_stage['RESEARCH DATA LIFECYCLE STAGE'] == stage]['DESCRIPTION (1 SENTENCE)'].iloc[0]))
-            logging.info(f"Inserted {len(lifecycle_data)} lifecycle stages.")
-
-            for _, row in df_stage.iterrows():
-                conn.execute("""
-                    INSERT OR REPLACE INTO SubStage (substagename, substagedesc, exemplar, stage) 
+        # Load everything in one transaction so the whole rebuild is committed once
+        with conn:
+            df_stage = data_frames.get('Tool categories and description')
+            if df_stage is not None:
+                # Only a dozen distinct stages repeat down the sheet; store them as category codes
+                df_stage['RESEARCH DATA LIFECYCLE STAGE'] = df_stage['RESEARCH DATA LIFECYCLE STAGE'].astype('category')
+
+                # First description seen for each stage, found in a single pass
+                stage_desc = df_stage.drop_duplicates('RESEARCH DATA LIFECYCLE STAGE').set_index(
+                    'RESEARCH DATA LIFECYCLE STAGE')['DESCRIPTION (1 SENTENCE)'].to_dict()
+                conn.executemany("INSERT OR REPLACE INTO LifeCycle (stage, stagedesc) VALUES (?, ?)", stage_desc.items())
+                logging.info(f"Inserted {len(stage_desc)} lifecycle stages.")
+
+                substage_columns = ['TOOL CATEGORY TYPE', 'DESCRIPTION (1 SENTENCE)', 'EXAMPLES', 'RESEARCH DATA LIFECYCLE STAGE']
+                conn.executemany("""
+                    INSERT OR REPLACE INTO SubStage (substagename, substagedesc, exemplar, stage)
                     VALUES (?, ?, ?, ?)
-                """, (row['TOOL CATEGORY TYPE'], row['DESCRIPTION (1 SENTENCE)'], row['EXAMPLES'], row['RESEARCH DATA LIFECYCLE STAGE']))
-
-        for sheet_name, df_tools in data_frames.items():
-            if sheet_name == 'Tool categories and description':
-                continue
-
-            required_columns = {'TOOL CHARACTERISTICS (ADDITIONAL USEFUL INFORMATION)', 'LINK TO TOOL (URL)', 'TOOL PROVIDER (NAME)'}
-            if not required_columns.issubset(df_tools.columns):
-                logging.warning(f"Skipping sheet {sheet_name} as it does not have the required columns.")
-                continue
-
-            stage = sheet_name.strip()
-            for _, row in df_tools.iterrows():
-                tools = row['TOOL NAME']
-                if isinstance(tools, str):
-                    for tool in tools.split(','):
-                        conn.execute("""
-                            INSERT OR REPLACE INTO Tools (ToolName, ToolDesc, ToolLink, ToolProvider, stage) 
-                            VALUES (?, ?, ?, ?, ?)
-                        """, (tool.strip(), row['TOOL CHARACTERISTICS (ADDITIONAL USEFUL INFORMATION)'], row['LINK TO TOOL (URL)'], row['TOOL PROVIDER (NAME)'], stage))
-
-        # Populate CycleConnects
-        cycle_connects_data = [
-            (1, 1, 2, 'normal'),
-            (2, 2, 3, 'normal'),
-            (3, 3, 4, 'normal'),
-            (4, 4, 5, 'normal'),
-            (5, 5, 6, 'normal'),
-            (6, 6, 7, 'normal'),
-            (7, 7, 8, 'normal'),
-            (8, 8, 9, 'normal'),
-            (9, 9, 10, 'normal'),
-            (10, 10, 11, 'normal'),
-            (11, 11, 12, 'normal'),
-            (12, 12, 1, 'normal'),
-            (13, 3, 4, 'alternative'),
-            (14, 4, 5, 'alternative'),
-            (15, 5, 6, 'alternative')
-        ]
-
-        conn.executemany("INSERT INTO CycleConnects (id, start, end, type) VALUES (?, ?, ?, ?)", cycle_connects_data)
-        logging.info(f"Inserted {len(cycle_connects_data)} cycle connections.")
-
-        conn.commit()
-        logging.info("Database initialized from Excel file.")
+                """, df_stage[substage_columns].itertuples(index=False, name=None))
+                logging.info(f"Inserted {len(df_stage)} substages.")
+
+            for sheet_name, df_tools in data_frames.items():
+                if sheet_name == 'Tool categories and description':
+                    continue
+
+                required_columns = {'TOOL CHARACTERISTICS (ADDITIONAL USEFUL INFORMATION)', 'LINK TO TOOL (URL)', 'TOOL PROVIDER (NAME)'}
+                if not required_columns.issubset(df_tools.columns):
+                    logging.warning(f"Skipping sheet {sheet_name} as it does not have the required columns.")
+                    continue
+
+                # One row per tool: split the comma-separated TOOL NAME cells and explode them
+                tool_names = df_tools['TOOL NAME'].astype(object)
+                tools = df_tools.assign(
+                    ToolName=tool_names.where(tool_names.map(type).eq(str)).str.strip().str.split(TOOL_NAME_SEPARATOR),
+                    stage=sheet_name.strip()
+                ).explode('ToolName').dropna(subset=['ToolName'])
+
+                conn.executemany("""
+                    INSERT OR REPLACE INTO Tools (ToolName, ToolDesc, ToolLink, ToolProvider, stage)
+                    VALUES (?, ?, ?, ?, ?)
+                """, tools[['ToolName', 'TOOL CHARACTERISTICS (ADDITIONAL USEFUL INFORMATION)', 'LINK TO TOOL (URL)',
+                            'TOOL PROVIDER (NAME)', 'stage']].itertuples(index=False, name=None))
+
+            populate_cycle_connects(conn)
+
+        conn.close()
+        conn = None
+        os.replace(build_file, db_file)
+        built = True
+        logging.info(f"Database {db_file} initialized from Excel file.")
     except (sqlite3.Error, pd.errors.EmptyDataError, KeyError) as e:
         logging.error(f"Error initializing database: {e}")
     finally:
         if conn:
             conn.close()
+        if not built and os.path.exists(build_file):
+            os.remove(build_file)
 
 
 if __name__ == "__main__":
+    # Set up logging; only when run as a script, so importers keep their own configuration
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     initialize_database_from_excel(EXCEL_FILE, DB_FILE)
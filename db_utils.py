@@ -0,0 +1,70 @@
+import logging
+import os
+from contextlib import contextmanager
+
+# Edges of the lifecycle graph as (id, start, end, type); start and end are 1-based stage positions
+CYCLE_CONNECTS = [
+    (1, 1, 2, 'normal'),
+    (2, 2, 3, 'normal'),
+    (3, 3, 4, 'normal'),
+    (4, 4, 5, 'normal'),
+    (5, 5, 6, 'normal'),
+    (6, 6, 7, 'normal'),
+    (7, 7, 8, 'normal'),
+    (8, 8, 9, 'normal'),
+    (9, 9, 10, 'normal'),
+    (10, 10, 11, 'normal'),
+    (11, 11, 12, 'normal'),
+    (12, 12, 1, 'normal'),
+    (13, 3, 4, 'alternative'),
+    (14, 4, 5, 'alternative'),
+    (15, 5, 6, 'alternative')
+]
+
+
+def apply_bulk_load_pragmas(conn):
+    """Configure a connection for building a new database file from scratch.
+
+    The journal is kept in memory and fsyncs are skipped, so a crash mid-load can
+    corrupt the file. Only use this on a file that is discarded if the build fails,
+    never on a database that already holds data. None of these settings persist.
+    """
+    conn.executescript("PRAGMA journal_mode=MEMORY; PRAGMA synchronous=OFF; "
+                       "PRAGMA temp_store=MEMORY; PRAGMA cache_size=-200000;")
+
+
+def populate_cycle_connects(conn):
+    """Insert the lifecycle graph edges into the CycleConnects table."""
+    conn.executemany("INSERT INTO CycleConnects (id, start, end, type) VALUES (?, ?, ?, ?)", CYCLE_CONNECTS)
+    logging.info(f"Inserted {len(CYCLE_CONNECTS)} cycle connections.")
+
+
+@contextmanager
+def exclusive_file_lock(lock_path):
+    """Hold an exclusive lock on lock_path across processes for the duration of the block.
+
+    The operating system releases the lock if the holder dies, so a crash cannot leave it stuck.
+    """
+    with open(lock_path, 'a+b') as lock_file:
+        if os.name == 'nt':
+            import msvcrt
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after ten one-second retries; keep waiting
+                    continue
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
@@ -1,11 +1,20 @@
 import os
+import re
+import json
+import hashlib
 import logging
-from dash import Dash, html, dcc, Input, Output, State, dash_table
+from contextlib import closing
+from dash import Dash, html, dcc, Input, Output, State, dash_table, ctx, Patch, no_update
 import dash_cytoscape as cyto
 import dash_bootstrap_components as dbc
+import numpy as np
 import pandas as pd
 import sqlite3
+from pathlib import Path
 from dash.exceptions import PreventUpdate
+from flask import Response
+from createdb_from_excel import EXCEL_FILE, initialize_database_from_excel
+from db_utils import exclusive_file_lock
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -22,9 +31,9 @@ DB_FILE = 'research_data_lifecycle.db'
 
 
 def get_db_connection():
-    """Create a database connection."""
+    """Open a read-only connection to the database. Callers close it once their queries are done."""
     try:
-        conn = sqlite3.connect(DB_FILE)
+        conn = sqlite3.connect(f"{Path(DB_FILE).resolve().as_uri()}?mode=ro", uri=True)
         conn.row_factory = sqlite3.Row
         return conn
     except sqlite3.Error as e:
@@ -32,24 +41,121 @@ def get_db_connection():
         raise
 
 
-def get_dataframe_from_db(query, params=()):
-    """Fetch data from the SQLite database and return as a pandas DataFrame."""
+def get_dataframes_from_db(queries):
+    """Run several queries in one read transaction and return a DataFrame per query name."""
     try:
-        with get_db_connection() as conn:
-            df = pd.read_sql_query(query, conn, params=params)
-        return df
-    except (sqlite3.Error, pd.io.sql.DatabaseError) as e:
+        with closing(get_db_connection()) as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN")
+            try:
+                frames = {}
+                for name, query in queries.items():
+                    cursor.execute(query)
+                    frames[name] = pd.DataFrame([tuple(row) for row in cursor.fetchall()],
+                                                columns=[column[0] for column in cursor.description])
+            finally:
+                conn.commit()
+        return frames
+    except sqlite3.Error as e:
         logger.error(f"Error executing query: {e}")
-        return pd.DataFrame()
+        return {name: pd.DataFrame() for name in queries}
+
+
+def fetch_records(query, params=()):
+    """Fetch rows from the SQLite database as a list of dicts, without building a DataFrame."""
+    try:
+        with closing(get_db_connection()) as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [dict(row) for row in rows]
+    except sqlite3.Error as e:
+        logger.error(f"Error executing query: {e}")
+        return []
+
 
+# Build the database on first start; connecting first would leave an empty file behind.
+# Every worker process runs this, so the check and build are serialized by a lock file.
+if not os.path.exists(DB_FILE):
+    with exclusive_file_lock(f"{DB_FILE}.lock"):
+        if not os.path.exists(DB_FILE):
+            logger.info(f"Database {DB_FILE} not found, building it from {EXCEL_FILE}")
+            initialize_database_from_excel(EXCEL_FILE, DB_FILE)
 
 # Fetch data
-lifecycle_stages_df = get_dataframe_from_db("SELECT stage, stagedesc FROM LifeCycle")
-lifecycle_stages = lifecycle_stages_df.set_index('stage')['stagedesc'].to_dict()
-cycle_connects_df = get_dataframe_from_db("SELECT id, start, end, type FROM CycleConnects")
-substages_df = get_dataframe_from_db("SELECT substagename AS substage, stage FROM SubStage")
-exemplars_df = get_dataframe_from_db("SELECT substagename AS substage, exemplar AS exemplarname, substagedesc AS exemplardesc FROM SubStage")
-tools_df = get_dataframe_from_db("SELECT ToolName, ToolDesc, ToolLink, ToolProvider, stage FROM Tools")
+lifecycle_stages = [row['stage'] for row in fetch_records("SELECT stage FROM LifeCycle ORDER BY rowid")]
+startup_frames = get_dataframes_from_db({
+    'cycle_connects': "SELECT id, start, end, type FROM CycleConnects",
+    'substages': "SELECT substagename AS substage, stage FROM SubStage",
+    'exemplars': "SELECT substagename AS substage, exemplar AS exemplarname, substagedesc AS exemplardesc FROM SubStage",
+    'tools': "SELECT ToolName, ToolDesc, ToolLink, ToolProvider, stage FROM Tools",
+})
+cycle_connects_df = startup_frames['cycle_connects']
+substages_df = startup_frames['substages']
+exemplars_df = startup_frames['exemplars']
+tools_df = startup_frames['tools']
+
+# Only absolute http(s) URLs become links; other ToolLink values are shown as plain text
+TOOL_URL = re.compile(r'https?://\S+')
+# A tool link as rendered for the table's markdown column, e.g. [https://x.org](https://x.org)
+MARKDOWN_LINK = re.compile(r'\[(?P<url>https?://\S+)\]\((?P=url)\)')
+
+
+def format_tool_link(link):
+    """Render a single ToolLink value the way the startup pass renders the whole column."""
+    link = (link or '').strip()
+    return f"[{link}]({link})" if TOOL_URL.fullmatch(link) else link
+
+
+# Render every tool link as Markdown once, rather than per row in the callbacks
+tool_links = tools_df['ToolLink'].fillna('').astype(str).str.strip()
+tools_df['ToolLink'] = ('[' + tool_links + '](' + tool_links + ')').where(
+    tool_links.str.fullmatch(TOOL_URL.pattern), tool_links)
+
+# Dropdown options for the stage pickers, shared by both dropdowns
+STAGE_OPTIONS = [{'label': stage, 'value': stage} for stage in lifecycle_stages]
+
+# CycleConnects stores 1-based stage positions; map them to stage names in insertion order
+STAGE_MAPPING = {i + 1: stage for i, stage in enumerate(lifecycle_stages)}
+
+# Per-stage lookups built once, so callbacks never have to filter the full tables
+SUBSTAGES_BY_STAGE = substages_df.groupby('stage', sort=False)['substage'].apply(list).to_dict()
+TOOLS_BY_STAGE = {stage: group for stage, group in tools_df.groupby('stage', sort=False)}
+EMPTY_TOOLS_DF = tools_df.iloc[0:0]
+EXEMPLARS_BY_SUBSTAGE = {
+    substage: list(group[['exemplarname', 'exemplardesc']].itertuples(index=False, name=None))
+    for substage, group in exemplars_df.groupby('substage', sort=False)
+}
+
+
+# Element styles shared by reference across every node and edge of both graphs
+NODE_STYLE = {
+    'shape': 'round-rectangle',
+    'width': '150px',
+    'height': '50px',
+    'background-color': '#E6F3FF',
+    'border-color': '#2E86C1',
+    'border-width': 2
+}
+EDGE_STYLE = {
+    'target-arrow-shape': 'triangle',
+    'line-color': '#2E86C1',
+    'target-arrow-color': '#2E86C1'
+}
+EDGE_STYLE_SOLID = {**EDGE_STYLE, 'line-style': 'solid'}
+EDGE_STYLE_DASHED = {**EDGE_STYLE, 'line-style': 'dashed'}
+EDGE_STYLES = {'solid': EDGE_STYLE_SOLID, 'dashed': EDGE_STYLE_DASHED}
+
+
+def circle_positions(count, spacing=180):
+    """Return preset node positions around a circle, starting at the top and going clockwise."""
+    radius = max(200, count * spacing / (2 * np.pi))
+    angles = np.linspace(0, 2 * np.pi, count, endpoint=False) - np.pi / 2
+    return [{'x': float(x), 'y': float(y)} for x, y in zip(radius * np.cos(angles), radius * np.sin(angles))]
+
+
+def grid_positions(count, spacing_x=200, spacing_y=100):
+    """Return preset node positions on a row-major grid that is as square as possible."""
+    columns = max(1, int(np.ceil(np.sqrt(count))))
+    return [{'x': (i % columns) * spacing_x, 'y': (i // columns) * spacing_y} for i in range(count)]
 
 
 def create_full_lifecycle_elements():
@@ -57,75 +163,142 @@ def create_full_lifecycle_elements():
     nodes = [
         {
             'data': {'id': stage, 'label': stage},
-            'style': {
-                'shape': 'round-rectangle',
-                'width': '150px',
-                'height': '50px',
-                'background-color': '#E6F3FF',
-                'border-color': '#2E86C1',
-                'border-width': 2
-            },
-            'tooltip': {'content': desc}
+            'position': position,
+            'style': NODE_STYLE
         }
-        for stage, desc in lifecycle_stages.items()
+        for stage, position in zip(lifecycle_stages, circle_positions(len(lifecycle_stages)))
     ]
 
-    edges = []
-    for idx, row in cycle_connects_df.iterrows():
-        if row['start'] not in lifecycle_stages or row['end'] not in lifecycle_stages:
-            logger.warning(f"Skipping edge with non-existent source or target: {row['start']} -> {row['end']}")
-            continue
+    # Filter and style every edge in one vectorized pass over the table
+    connects = cycle_connects_df[['start', 'end', 'type']].assign(
+        start=pd.to_numeric(cycle_connects_df['start'], errors='coerce').map(STAGE_MAPPING),
+        end=pd.to_numeric(cycle_connects_df['end'], errors='coerce').map(STAGE_MAPPING)
+    )
+    valid = connects['start'].notna() & connects['end'].notna()
+    if not valid.all():
+        logger.warning(f"Skipping {int((~valid).sum())} edges with non-existent source or target")
+    connects = connects[valid]
+    line_styles = np.where(connects['type'] == 'alternative', 'dashed', 'solid')
 
-        edge_style = {
-            'line-style': 'dashed' if row['type'] == 'alternative' else 'solid',
-            'target-arrow-shape': 'triangle',
-            'line-color': '#2E86C1',
-            'target-arrow-color': '#2E86C1'
+    edges = [
+        {
+            'data': {'source': start, 'target': end, 'label': edge_type},
+            'style': EDGE_STYLES[line_style]
         }
-
-        edges.append({
-            'data': {'source': row['start'], 'target': row['end'], 'label': row['type']},
-            'style': edge_style
-        })
+        for (start, end, edge_type), line_style in zip(connects.itertuples(index=False, name=None), line_styles)
+    ]
 
     return nodes + edges
 
 
+FULL_LIFECYCLE_ELEMENTS = create_full_lifecycle_elements()
+FULL_LIFECYCLE_ELEMENTS_JSON = json.dumps(FULL_LIFECYCLE_ELEMENTS)
+
+# Element payloads are served under URLs that embed a hash of their content, so browsers can
+# cache them indefinitely and a deploy that changes a payload also changes its URL
+IMMUTABLE_CACHE_HEADERS = {'Cache-Control': 'public, max-age=31536000, immutable'}
+
+
+def content_hash(*payloads):
+    """Return a short hash of the given JSON payloads, for use in cache-busting URLs."""
+    digest = hashlib.sha256()
+    for payload in payloads:
+        digest.update(payload.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+FULL_LIFECYCLE_ELEMENTS_PATH = f"lifecycle-elements.{content_hash(FULL_LIFECYCLE_ELEMENTS_JSON)}.json"
+
+
+@server.route(app.config.routes_pathname_prefix + FULL_LIFECYCLE_ELEMENTS_PATH)
+def serve_full_lifecycle_elements():
+    """Serve the static full lifecycle elements so browsers can cache them."""
+    return Response(FULL_LIFECYCLE_ELEMENTS_JSON, mimetype='application/json', headers=IMMUTABLE_CACHE_HEADERS)
+
+
 def create_focused_stage_elements(stage):
     """Create nodes and edges for the focused stage graph."""
-    substages = substages_df[substages_df['stage'] == stage]['substage'].tolist()
+    substages = SUBSTAGES_BY_STAGE.get(stage, [])
     nodes = [
         {
             'data': {'id': substage, 'label': substage},
-            'style': {
-                'shape': 'round-rectangle',
-                'width': '150px',
-                'height': '50px',
-                'background-color': '#E6F3FF',
-                'border-color': '#2E86C1',
-                'border-width': 2
-            },
-            'tooltip': {'content': f"Substage: {substage}"}
+            'position': position,
+            'style': NODE_STYLE
         }
-        for substage in substages
+        for substage, position in zip(substages, grid_positions(len(substages)))
     ]
     edges = [
         {
             'data': {'source': substages[i], 'target': substages[i + 1]},
-            'style': {
-                'target-arrow-shape': 'triangle',
-                'line-color': '#2E86C1',
-                'target-arrow-color': '#2E86C1'
-            }
+            'style': EDGE_STYLE
         }
         for i in range(len(substages) - 1)
     ]
     return nodes + edges
 
 
+# Build and serialize every stage's focused graph once at import
+FOCUSED_STAGE_ELEMENTS_JSON = {stage: json.dumps(create_focused_stage_elements(stage)) for stage in lifecycle_stages}
+FOCUSED_STAGE_ELEMENTS_PATH = f"focused-elements/{content_hash(*FOCUSED_STAGE_ELEMENTS_JSON.keys(), *FOCUSED_STAGE_ELEMENTS_JSON.values())}/"
+
+
+@server.route(app.config.routes_pathname_prefix + FOCUSED_STAGE_ELEMENTS_PATH + '<path:stage>.json')
+def serve_focused_stage_elements(stage):
+    """Serve the pre-serialized focused graph elements for a stage."""
+    return Response(FOCUSED_STAGE_ELEMENTS_JSON.get(stage, '[]'), mimetype='application/json',
+                    headers=IMMUTABLE_CACHE_HEADERS)
+
+
+# Substage details are immutable, so every panel is rendered once up front
+SUBSTAGE_INFO = {
+    substage_name: [
+        html.Div([
+            html.H4(substage_name),
+            html.P(f"Exemplar: {exemplar_name}"),
+            html.P(f"Description: {exemplar_desc}")
+        ]) for exemplar_name, exemplar_desc in exemplars
+    ]
+    for substage_name, exemplars in EXEMPLARS_BY_SUBSTAGE.items()
+}
+SUBSTAGE_INFO_PLACEHOLDER = [html.P("Select a substage to view details.")]
+
+
 def get_tools_for_stage(stage):
     """Get tools for the specified stage."""
-    return tools_df[tools_df['stage'] == stage]
+    return TOOLS_BY_STAGE.get(stage, EMPTY_TOOLS_DF)
+
+
+# Tools table rows for every (stage, sort column) pair, sorted and serialized once
+TOOL_SORT_COLUMNS = ('ToolName', 'ToolDesc', 'ToolProvider')
+TOOLS_SORTED = {
+    (stage, sort_by): get_tools_for_stage(stage).sort_values(by=[sort_by]).to_dict('records')
+    for stage in lifecycle_stages
+    for sort_by in TOOL_SORT_COLUMNS
+}
+
+
+# Cytoscape stylesheet shared by the full lifecycle and focused stage graphs
+GRAPH_STYLESHEET = [
+    {
+        'selector': 'node',
+        'style': {
+            'content': 'data(label)',
+            'text-valign': 'center',
+            'text-halign': 'center',
+            'font-size': '12px',
+            'color': '#000',  # Set text color
+        }
+    },
+    {
+        'selector': 'edge',
+        'style': {
+            'curve-style': 'bezier',
+            'target-arrow-shape': 'triangle',
+            'line-color': '#2E86C1',
+            'target-arrow-color': '#2E86C1'
+        }
+    }
+]
 
 
 # Updated app layout
@@ -137,95 +310,29 @@ app.layout = dbc.Container([
             html.H3("Full Lifecycle"),
             cyto.Cytoscape(
                 id='full-lifecycle-graph',
-                layout={'name': 'circle'},
+                layout={'name': 'preset', 'fit': True},
                 style={'width': '100%', 'height': '400px'},
-                elements=create_full_lifecycle_elements(),
-                stylesheet=[
-                    {
-                        'selector': 'node',
-                        'style': {
-                            'content': 'data(label)',
-                            'text-valign': 'center',
-                            'text-halign': 'center',
-                            'font-size': '12px',
-                            'color': '#000',  # Set text color
-                        }
-                    },
-                    {
-                        'selector': 'edge',
-                        'style': {
-                            'curve-style': 'bezier',
-                            'target-arrow-shape': 'triangle',
-                            'line-color': '#2E86C1',
-                            'target-arrow-color': '#2E86C1'
-                        }
-                    },
-                    {
-                        'selector': '.tooltip',
-                        'style': {
-                            'label': 'data(tooltip)',
-                            'text-opacity': 0,
-                            'text-background-color': '#fff',
-                            'text-background-opacity': 0.8,
-                            'text-background-shape': 'round-rectangle',
-                            'text-border-color': '#ccc',
-                            'text-border-width': 1,
-                            'text-border-opacity': 0.8,
-                            'text-margin-y': -10,
-                            'text-margin-x': -10
-                        }
-                    }
-                ]
+                minZoom=0.2,
+                maxZoom=3,
+                elements=[],
+                stylesheet=GRAPH_STYLESHEET
             )
         ], width=6),
         dbc.Col([
             html.H3("Focused Stage"),
             dcc.Dropdown(
                 id='stage-dropdown',
-                options=[{'label': stage, 'value': stage} for stage in lifecycle_stages.keys()],
-                value=list(lifecycle_stages.keys())[0] if lifecycle_stages else None
+                options=STAGE_OPTIONS,
+                value=STAGE_OPTIONS[0]['value'] if STAGE_OPTIONS else None
             ),
             cyto.Cytoscape(
                 id='focused-stage-graph',
-                layout={'name': 'grid'},
+                layout={'name': 'preset', 'fit': True},
                 style={'width': '100%', 'height': '350px'},
+                minZoom=0.2,
+                maxZoom=3,
                 elements=[],
-                stylesheet=[
-                    {
-                        'selector': 'node',
-                        'style': {
-                            'content': 'data(label)',
-                            'text-valign': 'center',
-                            'text-halign': 'center',
-                            'font-size': '12px',
-                            'color': '#000',  # Set text color
-                        }
-                    },
-                    {
-                        'selector': 'edge',
-                        'style': {
-                            'curve-style': 'bezier',
-                            'target-arrow-shape': 'triangle',
-                            'line-color': '#2E86C1',
-                            'target-arrow-color': '#2E86C1'
-                        }
-                    },
-                    {
-                        'selector': '.tooltip',
-                        'style': {
-                            'label': 'data(tooltip)',
-                            'text-opacity': 0,
-                            'text-background-color': '#fff',
-                            'text-background-opacity': 0.8,
-                            'text-background-shape': 'round-rectangle',
-                            'text-border-color': '#ccc',
-                            'text-border-width': 1,
-                            'text-border-opacity': 0.8,
-                            'text-margin-y': -10,
-                            'text-margin-x': -10
-                        }
-                    }
-                ]
+                stylesheet=GRAPH_STYLESHEET
             )
         ], width=6)
     ]),
@@ -243,7 +350,8 @@ app.layout = dbc.Container([
                     {'label': 'Sort by Description', 'value': 'ToolDesc'},
                     {'label': 'Sort by Provider', 'value': 'ToolProvider'}
                 ],
-                value='ToolName'
+                value='ToolName',
+                clearable=False
             ),
             dash_table.DataTable(
                 id='tools-table',
@@ -259,6 +367,8 @@ app.layout = dbc.Container([
                 row_deletable=True,
                 filter_action="native",
                 sort_action="native",
+                page_action="native",
+                page_size=25,
                 style_cell={'textAlign': 'left', 'whiteSpace': 'normal', 'height': 'auto'},
                 style_table={'overflowX': 'auto'}
             ),
@@ -279,8 +389,8 @@ app.layout = dbc.Container([
                             dbc.Label("Stage"),
                             dcc.Dropdown(
                                 id="tool-stage-dropdown",
-                                options=[{'label': stage, 'value': stage} for stage in lifecycle_stages.keys()],
-                                value=list(lifecycle_stages.keys())[0] if lifecycle_stages else None
+                                options=STAGE_OPTIONS,
+                                value=STAGE_OPTIONS[0]['value'] if STAGE_OPTIONS else None
                             )
                         ])
                     ]),
@@ -290,23 +400,41 @@ app.layout = dbc.Container([
                 ],
                 id="tool-modal",
                 is_open=False
-            )
+            ),
+            # Index in the table's data of the tool open for editing; None while adding a new tool
+            dcc.Store(id='editing-tool-index', data=None)
         ], width=6)
     ]),
     html.Div(id='dummy-output', style={'display': 'none'})
 ], fluid=True)
 
 
+# Load the full lifecycle graph from the cached JSON route instead of the page payload
+app.clientside_callback(
+    """
+    function(_) {
+        return fetch(%s).then(response => response.json());
+    }
+    """ % json.dumps(app.get_relative_path('/' + FULL_LIFECYCLE_ELEMENTS_PATH)),
+    Output('full-lifecycle-graph', 'elements'),
+    Input('dummy-output', 'children')
+)
+
+
 # Callbacks for updating focused stage graph and substage information
-@app.callback(
+app.clientside_callback(
+    """
+    function(selectedStage) {
+        if (!selectedStage) {
+            return window.dash_clientside.no_update;
+        }
+        return fetch(%s + encodeURIComponent(selectedStage) + '.json')
+            .then(response => response.json());
+    }
+    """ % json.dumps(app.get_relative_path('/' + FOCUSED_STAGE_ELEMENTS_PATH)),
     Output('focused-stage-graph', 'elements'),
     Input('stage-dropdown', 'value')
 )
-def update_focused_stage_graph(selected_stage):
-    """Update the focused stage graph based on the selected stage."""
-    if selected_stage:
-        return create_focused_stage_elements(selected_stage)
-    raise PreventUpdate
 
 
 @app.callback(
@@ -316,17 +444,10 @@ def update_focused_stage_graph(selected_stage):
 def display_substage_info(node_data):
     """Display information about the selected substage."""
     if node_data:
-        substage_name = node_data['id']
-        filtered_df = exemplars_df[exemplars_df['substage'] == substage_name]
-        if not filtered_df.empty:
-            return [
-                html.Div([
-                    html.H4(substage_name),
-                    html.P(f"Exemplar: {row['exemplarname']}"),
-                    html.P(f"Description: {row['exemplardesc']}")
-                ]) for idx, row in filtered_df.iterrows()
-            ]
-    return [html.P("Select a substage to view details.")]
+        info = SUBSTAGE_INFO.get(node_data['id'])
+        if info:
+            return info
+    return SUBSTAGE_INFO_PLACEHOLDER
 
 
 @app.callback(
@@ -343,34 +464,70 @@ def update_stage_dropdown(node_data):
 @app.callback(
     Output('tools-table', 'data'),
     [Input('stage-dropdown', 'value'),
-     Input('tool-sort-dropdown', 'value'),
      Input('save-tool-button', 'n_clicks')],
-    [State('tool-name-input', 'value'),
+    [State('tool-sort-dropdown', 'value'),
+     State('tool-name-input', 'value'),
      State('tool-desc-input', 'value'),
      State('tool-link-input', 'value'),
      State('tool-provider-input', 'value'),
      State('tool-stage-dropdown', 'value'),
-     State('tools-table', 'data')]
+     State('editing-tool-index', 'data')]
 )
-def update_tools_table(selected_stage, sort_by, n_clicks, name, desc, link, provider, stage, data):
-    """Update the tools table based on the selected stage, sorting option, and when a new tool is added."""
-    if n_clicks and name and desc and link and provider and stage:
-        new_tool = {
+def update_tools_table(selected_stage, n_clicks, sort_by, name, desc, link, provider, stage, editing_index):
+    """Update the tools table based on the selected stage, and when a tool is added or edited."""
+    if ctx.triggered_id == 'save-tool-button':
+        # Saving only touches the rows already shown, so send just the changed row
+        if not (n_clicks and name and desc and link and provider and stage):
+            raise PreventUpdate
+        rows = Patch()
+        if stage != selected_stage:
+            # The table only lists the selected stage; an edited tool moved elsewhere leaves it
+            if editing_index is None:
+                raise PreventUpdate
+            del rows[editing_index]
+            return rows
+
+        tool = {
             "ToolName": name,
             "ToolDesc": desc,
-            "ToolLink": f"[{link}]({link})" if link else "",
+            "ToolLink": link if MARKDOWN_LINK.fullmatch(link) else format_tool_link(link),
             "ToolProvider": provider,
             "stage": stage
         }
-        data.append(new_tool)
+        if editing_index is None:
+            rows.append(tool)
+        else:
+            rows[editing_index] = tool
+        return rows
 
     if selected_stage:
-        tools_df_stage = get_tools_for_stage(selected_stage)
-        tools_df_stage_sorted = tools_df_stage.sort_values(by=[sort_by])
-        return tools_df_stage_sorted.to_dict('records')
+        return TOOLS_SORTED.get((selected_stage, sort_by or 'ToolName'), [])
     raise PreventUpdate
 
 
+# Re-sort the rows already in the table in the browser; missing values sort last, as in pandas
+app.clientside_callback(
+    """
+    function(sortBy, rows) {
+        if (!sortBy || !rows) {
+            return window.dash_clientside.no_update;
+        }
+        return rows.slice().sort((a, b) => {
+            const x = a[sortBy], y = b[sortBy];
+            if (x == null || y == null) {
+                return (x == null) - (y == null);
+            }
+            return x < y ? -1 : x > y ? 1 : 0;
+        });
+    }
+    """,
+    Output('tools-table', 'data', allow_duplicate=True),
+    Input('tool-sort-dropdown', 'value'),
+    State('tools-table', 'data'),
+    prevent_initial_call=True
+)
+
+
 @app.callback(
     Output('tool-modal', 'is_open'),
     [Input('add-tool-button', 'n_clicks'),
@@ -390,18 +547,31 @@ def toggle_tool_modal(n1, active_cell, is_open, rows):
      Output('tool-desc-input', 'value'),
      Output('tool-link-input', 'value'),
      Output('tool-provider-input', 'value'),
-     Output('tool-stage-dropdown', 'value')],
-    [Input('tools-table', 'active_cell')],
-    [State('tools-table', 'data')]
+     Output('tool-stage-dropdown', 'value'),
+     Output('editing-tool-index', 'data')],
+    [Input('tools-table', 'active_cell'),
+     Input('add-tool-button', 'n_clicks'),
+     Input('save-tool-button', 'n_clicks')],
+    [State('tools-table', 'derived_viewport_data'),
+     State('tools-table', 'derived_viewport_indices')]
 )
-def load_tool_data(active_cell, rows):
-    """Load tool data into the modal for editing."""
-    if active_cell:
+def load_tool_data(active_cell, add_clicks, save_clicks, rows, indices):
+    """Load tool data into the modal for editing, or clear it for adding a new tool."""
+    if ctx.triggered_id == 'save-tool-button':
+        # The saved edit is done; a further Save adds a new tool
+        return no_update, no_update, no_update, no_update, no_update, None
+    if ctx.triggered_id == 'tools-table' and active_cell:
+        # active_cell['row'] counts rows on the current page, so index the page's rows
         row = rows[active_cell['row']]
-        return row['ToolName'], row['ToolDesc'], row['ToolLink'], row['ToolProvider'], row['stage']
-    return "", "", "", "", ""
+        # Edit the bare URL, not its markdown rendering, so saving does not wrap it twice
+        link = MARKDOWN_LINK.fullmatch(row['ToolLink'] or '')
+        return (row['ToolName'], row['ToolDesc'], link['url'] if link else row['ToolLink'], row['ToolProvider'],
+                row['stage'], indices[active_cell['row']])
+    return "", "", "", "", "", None
 
 
 # Run the app
+# Built-in server, as started by web.config; on Linux hosts `main:server` can run under gunicorn instead
 if __name__ == '__main__':
-    app.run_server(debug=True)
+    app.run_server(port=int(os.environ.get('PORT', 8050)),
+                   debug=os.environ.get('DASH_DEV', '').strip().lower() in ('1', 'true', 'yes', 'on'))